@@ -185,6 +185,7 @@ pub(crate) fn impl_pyenum(input: TokenStream) -> TokenStream {
     let variants = variants.clone().into_iter().map(|v| v);
     let mut names = Vec::new();
     let mut values = Vec::new();
+    let mut indexes = Vec::new();
     let mut actual = 0i64;
     for variant in variants.clone() {
         if variant.fields != syn::Fields::Unit {
@@ -204,6 +205,7 @@ pub(crate) fn impl_pyenum(input: TokenStream) -> TokenStream {
             }
         }
 
+        indexes.push(names.len());
         names.push(variant.ident.clone());
         values.push(actual);
         actual += 1;
@@ -260,7 +262,25 @@ pub(crate) fn impl_pyenum(input: TokenStream) -> TokenStream {
         impl egui_pysync::ToPython for #ident {
             fn to_python<'py>(&self, py: egui_pysync::pyo3::Python<'py>) -> egui_pysync::pyo3::Bound<'py, egui_pysync::pyo3::types::PyAny> {
                 use egui_pysync::pyo3::conversion::IntoPyObjectExt;
-                self.into_bound_py_any(py).unwrap()
+
+                // enum is frozen, so one python object per variant is created and shared
+                static MEMBERS: std::sync::OnceLock<Vec<egui_pysync::pyo3::Py<egui_pysync::pyo3::types::PyAny>>> =
+                    std::sync::OnceLock::new();
+
+                let members = match MEMBERS.get() {
+                    Some(members) => members,
+                    None => {
+                        // not get_or_init, initialization must not block other threads holding the GIL
+                        let members = vec![#(Self::#names.into_py_any(py).unwrap()),*];
+                        let _ = MEMBERS.set(members);
+                        MEMBERS.get().unwrap()
+                    }
+                };
+
+                let index = match self {
+                    #(Self::#names => #indexes,)*
+                };
+                members[index].bind(py).clone()
             }
         }
     );
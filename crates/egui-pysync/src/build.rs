@@ -344,11 +344,12 @@ impl State {
             file.write_all(b"    def __init__(self, update: Callable[[float | None], None]):\n")
                 .unwrap();
             file.write_all(b"        self._update = update\n").unwrap();
-            file.write_all(b"        c = sc._Counter()\n\n").unwrap();
+            file.write_all(b"        c = sc._new_counter()\n\n")
+                .unwrap();
         } else if !written.contains(&self.name) {
             file.write_all(format!("\n\nclass {}(sc._StatesBase):\n", self.name).as_bytes())
                 .unwrap();
-            file.write_all(b"    def __init__(self, c: sc._Counter):\n")
+            file.write_all(b"    def __init__(self, c: sc._IdCounter):\n")
                 .unwrap();
             written.push(self.name.clone());
         } else {
@@ -88,6 +88,7 @@ pub(crate) mod server {
     use pyo3::types::PyDict;
     use serde::Serialize;
 
+    use crate::commands::CommandMessage;
     use crate::python_convert::ToPython;
     use crate::server::SyncTrait;
     use crate::transport::{serialize, WriteMessage};
@@ -112,6 +113,7 @@ pub(crate) mod server {
             value: &Bound<PyAny>,
             update: bool,
         ) -> PyResult<()>;
+        fn set_items_py(&self, dict: &Bound<PyAny>, update: bool) -> PyResult<()>;
         fn del_item_py(&self, key: &Bound<PyAny>, update: bool) -> PyResult<()>;
         fn len_py(&self) -> usize;
     }
@@ -200,6 +202,34 @@ pub(crate) mod server {
             Ok(())
         }
 
+        fn set_items_py(&self, dict: &Bound<PyAny>, update: bool) -> PyResult<()> {
+            let dict = dict.downcast::<pyo3::types::PyDict>()?;
+            let mut items: Vec<(K, V)> = Vec::with_capacity(dict.len());
+
+            for (key, value) in dict {
+                items.push((key.extract()?, value.extract()?));
+            }
+
+            let mut d = self.dict.write().unwrap();
+
+            if self.connected.load(Ordering::Relaxed) {
+                if items.is_empty() && update {
+                    let message = WriteMessage::Command(CommandMessage::Update(0.0));
+                    self.channel.send(message).unwrap();
+                }
+
+                let last = items.len().saturating_sub(1);
+                for (i, (key, value)) in items.iter().enumerate() {
+                    let data = serialize(DictMessageRef::Set::<K, V>(key, value));
+                    let message = WriteMessage::Dict(self.id, update && i == last, data);
+                    self.channel.send(message).unwrap();
+                }
+            }
+
+            d.extend(items);
+            Ok(())
+        }
+
         fn set_py(&self, dict: &Bound<PyAny>, update: bool) -> PyResult<()> {
             let dict = dict.downcast::<pyo3::types::PyDict>()?;
             let mut new_dict = HashMap::new();
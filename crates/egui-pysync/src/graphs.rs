@@ -21,8 +21,14 @@ pub struct Graph<T> {
 impl<T: GraphElement> Graph<T> {
     #[cfg(feature = "server")]
     fn to_graph_data(&self) -> (GraphDataInfo<T>, Vec<u8>) {
-        let bytes_size = std::mem::size_of::<T>() * self.y.len();
-        let points = self.y.len();
+        self.to_graph_data_from(0)
+    }
+
+    // serialize only points from the start index, used to send just added points
+    #[cfg(feature = "server")]
+    fn to_graph_data_from(&self, start: usize) -> (GraphDataInfo<T>, Vec<u8>) {
+        let points = self.y.len() - start;
+        let bytes_size = std::mem::size_of::<T>() * points;
 
         match self.x {
             Some(ref x) => {
@@ -30,13 +36,13 @@ impl<T: GraphElement> Graph<T> {
                 #[cfg(target_endian = "little")]
                 {
                     let dat_slice = unsafe {
-                        let ptr = x.as_ptr() as *const u8;
+                        let ptr = x[start..].as_ptr() as *const u8;
                         std::slice::from_raw_parts(ptr, bytes_size)
                     };
                     data[..bytes_size].copy_from_slice(dat_slice);
 
                     let dat_slice = unsafe {
-                        let ptr = self.y.as_ptr() as *const u8;
+                        let ptr = self.y[start..].as_ptr() as *const u8;
                         std::slice::from_raw_parts(ptr, bytes_size)
                     };
                     data[bytes_size..].copy_from_slice(dat_slice);
@@ -56,7 +62,7 @@ impl<T: GraphElement> Graph<T> {
                 #[cfg(target_endian = "little")]
                 {
                     let dat_slice = unsafe {
-                        let ptr = self.y.as_ptr() as *const u8;
+                        let ptr = self.y[start..].as_ptr() as *const u8;
                         std::slice::from_raw_parts(ptr, bytes_size)
                     };
                     data.copy_from_slice(dat_slice);
@@ -347,10 +353,11 @@ pub(crate) mod server {
             let graph = w
                 .get_mut(&idx)
                 .ok_or_else(|| PyValueError::new_err("Graph not found"))?;
+            let start = graph.y.len();
             buffer_to_graph_add(&buffer, graph)?;
 
             if self.connected.load(Ordering::Relaxed) {
-                let (info, data) = graph.to_graph_data();
+                let (info, data) = graph.to_graph_data_from(start);
                 let message = serialize(GraphMessage::AddPoints(idx, info));
                 self.channel
                     .send(WriteMessage::Graph(self.id, update, message, Some(data)))
@@ -86,6 +86,7 @@ pub(crate) mod server {
     use pyo3::types::PyList;
     use serde::Serialize;
 
+    use crate::commands::CommandMessage;
     use crate::python_convert::ToPython;
     use crate::server::SyncTrait;
     use crate::transport::{serialize, WriteMessage};
@@ -104,6 +105,7 @@ pub(crate) mod server {
         fn set_py(&self, list: &Bound<PyAny>, update: bool) -> PyResult<()>;
         fn set_item_py(&self, idx: usize, value: &Bound<PyAny>, update: bool) -> PyResult<()>;
         fn add_item_py(&self, value: &Bound<PyAny>, update: bool) -> PyResult<()>;
+        fn add_items_py(&self, values: &Bound<PyAny>, update: bool) -> PyResult<()>;
         fn del_item_py(&self, idx: usize, update: bool) -> PyResult<()>;
         fn len_py(&self) -> usize;
     }
@@ -227,6 +229,32 @@ pub(crate) mod server {
             Ok(())
         }
 
+        fn add_items_py(&self, values: &Bound<PyAny>, update: bool) -> PyResult<()> {
+            let mut data: Vec<T> = Vec::new();
+            for val in values.try_iter()? {
+                data.push(val?.extract()?);
+            }
+
+            let mut list = self.list.write().unwrap();
+            if self.connected.load(Ordering::Relaxed) {
+                if data.is_empty() && update {
+                    let message = WriteMessage::Command(CommandMessage::Update(0.0));
+                    self.channel.send(message).unwrap();
+                }
+
+                let last = data.len().saturating_sub(1);
+                for (i, value) in data.iter().enumerate() {
+                    let data = serialize(ListMessageRef::Add(value));
+                    let message = WriteMessage::List(self.id, update && i == last, data);
+                    self.channel.send(message).unwrap();
+                }
+            }
+
+            list.extend(data);
+
+            Ok(())
+        }
+
         fn len_py(&self) -> usize {
             self.list.read().unwrap().len()
         }
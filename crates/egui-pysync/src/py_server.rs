@@ -10,6 +10,7 @@ use pyo3::types::{PyByteArray, PyDict, PyList, PyTuple};
 
 use crate::NoHashSet;
 use crate::commands::CommandMessage;
+use crate::python_convert::ToPython;
 use crate::server::Server;
 use crate::signals::ChangedValues;
 use crate::states_server::{PyValuesList, ServerValuesCreator};
@@ -35,6 +36,23 @@ impl Drop for StateServerCore {
     }
 }
 
+impl StateServerCore {
+    fn retain_registed(&self, values: &mut Vec<(u32, Box<dyn ToPython + Send + Sync>)>) {
+        let registed_values = self.registed_values.read().unwrap();
+        values.retain(|(value_id, _)| registed_values.contains(value_id));
+    }
+
+    fn registed_changed_values(
+        &self,
+        thread_id: u32,
+        max_n: usize,
+    ) -> Vec<(u32, Box<dyn ToPython + Send + Sync>)> {
+        let mut values = self.changed_values.try_changed_values(thread_id, max_n);
+        self.retain_registed(&mut values);
+        values
+    }
+}
+
 #[pymethods]
 impl StateServerCore {
     #[new]
@@ -141,6 +159,36 @@ impl StateServerCore {
         (value_id, arg)
     }
 
+    fn value_get_signal_batch<'py>(
+        &self,
+        py: Python<'py>,
+        thread_id: u32,
+        max_n: usize,
+    ) -> Vec<(u32, Bound<'py, PyAny>)> {
+        // signals already waiting are taken without releasing the GIL
+        let mut values = self.registed_changed_values(thread_id, max_n);
+        if values.is_empty() {
+            values = py.allow_threads(|| {
+                loop {
+                    let mut res = self.changed_values.wait_changed_values(thread_id, max_n);
+                    self.retain_registed(&mut res);
+                    if !res.is_empty() {
+                        break res;
+                    }
+                }
+            });
+        }
+
+        values
+            .into_iter()
+            .map(|(value_id, value)| (value_id, value.to_python(py)))
+            .collect()
+    }
+
+    fn signals_queue_len(&self) -> usize {
+        self.changed_values.pending()
+    }
+
     fn signal_set(&self, value_id: u32, value: &Bound<PyAny>) -> PyResult<()> {
         match self.values.signals.get(&value_id) {
             Some(signal) => signal.set_py(value),
@@ -178,6 +226,45 @@ impl StateServerCore {
         }
     }
 
+    fn values_set_batch<'py>(
+        &self,
+        values: Vec<(u32, Bound<'py, PyAny>)>,
+        set_signal: bool,
+        update: bool,
+    ) -> PyResult<()> {
+        let mut setters = Vec::with_capacity(values.len());
+        for (value_id, value) in values.iter() {
+            match self.values.values.get(value_id) {
+                Some(setter) => setters.push((setter, value)),
+                None => {
+                    return Err(pyo3::exceptions::PyValueError::new_err(format!(
+                        "Value with id {} is not available.",
+                        value_id
+                    )));
+                }
+            }
+        }
+
+        if setters.is_empty() {
+            if update {
+                self.update(None);
+            }
+            return Ok(());
+        }
+
+        let last = setters.len() - 1;
+        for (i, (setter, value)) in setters.into_iter().enumerate() {
+            if let Err(e) = setter.set_py(value, set_signal, update && i == last) {
+                // values before the failed one are already sent, the client has to be updated for them
+                if update && i > 0 {
+                    self.update(None);
+                }
+                return Err(e);
+            }
+        }
+        Ok(())
+    }
+
     // static values ----------------------------------------------------------
     fn static_set(&self, py: Python, value_id: u32, value: PyObject, update: bool) -> PyResult<()> {
         match self.values.static_values.get(&value_id) {
@@ -293,6 +380,21 @@ impl StateServerCore {
         }
     }
 
+    fn dict_items_set_batch(
+        &self,
+        value_id: u32,
+        dict: &Bound<PyAny>,
+        update: bool,
+    ) -> PyResult<()> {
+        match self.values.dicts.get(&value_id) {
+            Some(dict_) => dict_.set_items_py(dict, update),
+            None => Err(pyo3::exceptions::PyValueError::new_err(format!(
+                "Dict value with id {} is not available.",
+                value_id
+            ))),
+        }
+    }
+
     fn dict_item_del(&self, value_id: u32, key: &Bound<PyAny>, update: bool) -> PyResult<()> {
         match self.values.dicts.get(&value_id) {
             Some(dict) => dict.del_item_py(key, update),
@@ -385,6 +487,21 @@ impl StateServerCore {
         }
     }
 
+    fn list_items_add_batch(
+        &self,
+        value_id: u32,
+        values: &Bound<PyAny>,
+        update: bool,
+    ) -> PyResult<()> {
+        match self.values.lists.get(&value_id) {
+            Some(list) => list.add_items_py(values, update),
+            None => Err(pyo3::exceptions::PyValueError::new_err(format!(
+                "List value with id {} is not available.",
+                value_id
+            ))),
+        }
+    }
+
     fn list_len(&self, value_id: u32) -> PyResult<usize> {
         match self.values.lists.get(&value_id) {
             Some(list) => Ok(list.len_py()),
@@ -1,7 +1,6 @@
 use std::collections::VecDeque;
-use std::sync::{Arc, Mutex};
+use std::sync::{Arc, Condvar, Mutex};
 
-use crate::event::Event;
 use crate::python_convert::ToPython;
 use crate::{NoHashMap, NoHashSet};
 
@@ -18,9 +17,14 @@ impl OrderedMap {
         }
     }
 
-    fn insert(&mut self, id: u32, value: Box<dyn ToPython + Sync + Send>) {
-        self.values.insert(id, value);
-        self.indexes.push_back(id);
+    // returns true if the id was not in the map, otherwise only the value is replaced
+    // and the id keeps its place in the queue
+    fn insert(&mut self, id: u32, value: Box<dyn ToPython + Sync + Send>) -> bool {
+        if self.values.insert(id, value).is_none() {
+            self.indexes.push_back(id);
+            return true;
+        }
+        false
     }
 
     fn pop_first(&mut self) -> Option<(u32, Box<dyn ToPython + Sync + Send>)> {
@@ -38,7 +42,8 @@ struct ChnegedInner {
     values: OrderedMap,                                       // values not blocked
     blocked: NoHashMap<u32, Box<dyn ToPython + Sync + Send>>, // values blocked by some thread
     block_list: NoHashSet<u32>,                               // ids blocked by some thread
-    threads_last: NoHashMap<u32, u32>,                        // cache last id for each thread
+    threads_last: NoHashMap<u32, Vec<u32>>,                   // cache last ids for each thread
+    waiting: usize,                                           // threads waiting for new values
 }
 
 /*
@@ -52,84 +57,137 @@ impl ChnegedInner {
             blocked: NoHashMap::default(),
             block_list: NoHashSet::default(),
             threads_last: NoHashMap::default(),
+            waiting: 0,
         }
     }
 
-    fn set(&mut self, id: u32, value: Box<dyn ToPython + Sync + Send>, event: &Event) {
+    // returns true if a new value is available for any waiting thread
+    fn set(&mut self, id: u32, value: Box<dyn ToPython + Sync + Send>) -> bool {
         if self.block_list.contains(&id) {
             self.blocked.insert(id, value);
+            false
         } else {
-            self.values.insert(id, value);
-            event.set_one();
+            self.values.insert(id, value)
         }
     }
 
-    fn get(&mut self, thread_id: u32) -> Option<(u32, Box<dyn ToPython + Send + Sync>)> {
-        match self.threads_last.get(&thread_id) {
-            // previous call was made
-            Some(last_id) => {
-                if self.block_list.contains(last_id) {
-                    let val = self.blocked.remove(last_id);
-                    match val {
-                        Some(v) => Some((*last_id, v)),
-                        None => {
-                            let val = self.values.pop_first();
-                            self.block_list.remove(last_id);
-
-                            if let Some(ref v) = val {
-                                self.threads_last.insert(thread_id, v.0);
-                                self.block_list.insert(v.0);
-                            }
-                            val
-                        }
-                    }
-                } else {
-                    let val = self.values.pop_first();
-                    if let Some(ref v) = val {
-                        self.threads_last.insert(thread_id, v.0);
-                        self.block_list.insert(v.0);
-                    }
-                    val
+    // free values and values parked for the threads which are processing their ids
+    fn pending(&self) -> usize {
+        self.values.values.len() + self.blocked.len()
+    }
+
+    fn get(&mut self, thread_id: u32, max_n: usize) -> Vec<(u32, Box<dyn ToPython + Send + Sync>)> {
+        let mut batch = Vec::new();
+        let mut held = self.threads_last.remove(&thread_id).unwrap_or_default();
+
+        // ids processed by this thread last time, new values for them have to go to this thread
+        held.retain(|id| {
+            if batch.len() >= max_n {
+                return true;
+            }
+
+            match self.blocked.remove(id) {
+                Some(v) => {
+                    batch.push((*id, v));
+                    true
+                }
+                None => {
+                    self.block_list.remove(id);
+                    false
                 }
             }
-            // this is first time
-            None => {
-                let val = self.values.pop_first();
-                if let Some(ref v) = val {
-                    self.threads_last.insert(thread_id, v.0);
+        });
+
+        // taken ids are reserved for this thread until its next call, so the waiting threads
+        // get their share of the pending ids instead of waiting behind this thread
+        let share = self.values.values.len().div_ceil(self.waiting + 1);
+        let max_n = max_n.min(batch.len() + share);
+        while batch.len() < max_n {
+            match self.values.pop_first() {
+                Some(v) => {
                     self.block_list.insert(v.0);
+                    held.push(v.0);
+                    batch.push(v);
                 }
-                val
+                None => break,
             }
         }
+
+        if !held.is_empty() {
+            self.threads_last.insert(thread_id, held);
+        }
+        batch
+    }
+
+    // pending ids were left for the waiting threads
+    fn wake_waiting(&self) -> bool {
+        self.waiting > 0 && !self.values.values.is_empty()
     }
 }
 
 #[derive(Clone)]
 pub(crate) struct ChangedValues {
-    event: Event,
+    // waiting threads are woken on the same mutex which guards the values, so setting
+    // or getting values takes only one lock and no wake up can be lost
+    cond: Arc<Condvar>,
     values: Arc<Mutex<ChnegedInner>>,
 }
 
 impl ChangedValues {
     pub fn new() -> Self {
         Self {
-            event: Event::new(),
+            cond: Arc::new(Condvar::new()),
             values: Arc::new(Mutex::new(ChnegedInner::new())),
         }
     }
 
     pub fn set(&self, id: u32, value: impl ToPython + Sync + Send + 'static) {
         let value = Box::new(value);
-        self.values.lock().unwrap().set(id, value, &self.event);
+        let available = self.values.lock().unwrap().set(id, value);
+        if available {
+            self.cond.notify_one();
+        }
+    }
+
+    pub fn pending(&self) -> usize {
+        self.values.lock().unwrap().pending()
     }
 
     pub fn wait_changed_value(&self, thread_id: u32) -> (u32, Box<dyn ToPython + Send + Sync>) {
+        self.wait_changed_values(thread_id, 1).pop().unwrap()
+    }
+
+    pub fn try_changed_values(
+        &self,
+        thread_id: u32,
+        max_n: usize,
+    ) -> Vec<(u32, Box<dyn ToPython + Send + Sync>)> {
+        let mut inner = self.values.lock().unwrap();
+        let values = inner.get(thread_id, max_n.max(1));
+        if inner.wake_waiting() {
+            self.cond.notify_one();
+        }
+        values
+    }
+
+    pub fn wait_changed_values(
+        &self,
+        thread_id: u32,
+        max_n: usize,
+    ) -> Vec<(u32, Box<dyn ToPython + Send + Sync>)> {
+        let max_n = max_n.max(1);
+        let mut inner = self.values.lock().unwrap();
         loop {
-            if let Some(val) = self.values.lock().unwrap().get(thread_id) {
-                return val;
+            let values = inner.get(thread_id, max_n);
+            if !values.is_empty() {
+                if inner.wake_waiting() {
+                    self.cond.notify_one();
+                }
+                return values;
             }
-            self.event.wait_lock();
+            inner.waiting += 1;
+            inner = self.cond.wait(inner).unwrap();
+            inner.waiting -= 1;
         }
     }
 }
@@ -1,9 +1,10 @@
 from collections.abc import Callable
 from types import ModuleType
+from typing import Any
 
 from egui_pysync.signals import SignalsManager
 from egui_pysync.typing import SteteServerCoreBase
-from egui_pysync.structures import ErrorSignal, _MainStatesBase, _StatesBase, _StaticBase, _ValueBase
+from egui_pysync.structures import ErrorSignal, Value, _MainStatesBase, _StatesBase, _StaticBase, _ValueBase
 
 
 def _initialize_states(obj, server: SteteServerCoreBase, signals_manager: SignalsManager) -> None:
@@ -28,11 +29,16 @@ class StateServer[T: _MainStatesBase]:
         error_handler: Callable[[Exception], None] | None = None,
         ip_addr: tuple[int, int, int, int] | None = None,
         handshake: list[int] | None = None,
+        max_signals_workers: int | None = None,
     ) -> None:
-        """Initialize the SteteServer."""
+        """Initialize the SteteServer.
+
+        Signals are processed by signals_workers threads. If max_signals_workers is larger and all workers are busy
+        while signals keep waiting, additional workers are started up to max_signals_workers.
+        """
         core_server_class: type[SteteServerCoreBase] = getattr(core_module, "StateServerCore")
         self._server = core_server_class(port, ip_addr, handshake)
-        self._signals_manager = SignalsManager(self._server, signals_workers, error_handler)
+        self._signals_manager = SignalsManager(self._server, signals_workers, error_handler, max_signals_workers)
         self._states: T = state_class(self._server.update)
 
         _initialize_states(self._states, self._server, self._signals_manager)
@@ -51,11 +57,33 @@ class StateServer[T: _MainStatesBase]:
         """
         self._server.update(duration)
 
+    def set_many(self, values: list[tuple[Value, Any]], set_signal: bool = False, update: bool = False) -> None:
+        """Set multiple values at once.
+
+        All value ids are checked before anything is set. If a new value can not be converted, the values before it stay
+        set and the error is raised, the UI is still updated for them if update is True.
+
+        Args:
+            values(list[tuple[Value, Any]]): Pairs of the value and the new value to set.
+            set_signal(bool, optional): Whether to set the signals. Defaults to False.
+            update(bool, optional): Whether to update the UI. Defaults to False.
+        """
+        self._server.values_set_batch([(v._value_id, value) for v, value in values], set_signal, update)
+
     def start(self) -> None:
         """Start the state server."""
         self._signals_manager.start_manager()
         self._server.start()
 
+    async def start_async(self) -> None:
+        """Start the state server and process the signals in the running asyncio event loop.
+
+        Use it instead of start. Callbacks can be also coroutine functions, they are scheduled as tasks in the loop.
+        The coroutine runs until it is cancelled.
+        """
+        self._server.start()
+        await self._signals_manager.run_async()
+
     def stop(self) -> None:
         """Stop the state server."""
         self._server.stop()
@@ -76,7 +104,7 @@ class StateServer[T: _MainStatesBase]:
         """Set the error handler.
 
         Function that will be called when an error occurs in the signals threads. By default, it prints the traceback.
-        Be careful, if error is not handled, the thread will be stopped.
+        If the error handler raises an error, its traceback is printed and the thread continues with the next signals.
 
         Args:
             error_handler(Callable[[Exception], None] | None): The error handler function.
@@ -1,10 +1,25 @@
+import asyncio
 import inspect
 import threading
+import time
 import traceback
-from collections.abc import Callable
+from collections import deque
+from collections.abc import Callable, Iterator
+from typing import Any
 
 from egui_pysync.typing import SteteServerCoreBase
 
+_SIGNALS_BATCH = 64  # maximum number of signals taken from the core in one call
+_SATURATED_BATCHES = 3  # batches in a row finished with all workers busy and signals waiting to add a worker
+_YIELD_BATCH = 8  # batch size after which the worker yields the GIL before taking the next batch
+_READER_THREAD_ID = 0xFFFF_FFFF  # thread id of the asyncio reader, it can not collide with the workers ids
+
+
+def _takes_argument(callback: Callable) -> bool:
+    if inspect.ismethod(callback) and callback.__code__.co_argcount == 1:
+        return False
+    return callback.__code__.co_argcount != 0
+
 
 class SignalsManager:
     """The class for managing signals."""
@@ -14,76 +29,302 @@ class SignalsManager:
         server: SteteServerCoreBase,
         workers: int,
         error_handler: Callable[[Exception], None] | None,
+        max_workers: int | None = None,
     ):
         """Initialize the SignalsManager."""
-        self._callbacks: dict[int, list[Callable]] = {}
+        # callbacks are immutable tuples of (callback, pass argument), replaced on every change
+        self._callbacks: dict[int, tuple[tuple[Callable, bool], ...]] = {}
+        self._callbacks_lock = threading.Lock()
+        # specialized function calling all callbacks of the signal, rebuilt on every change
+        self._dispatch: dict[int, Callable[[Any], Any]] = {}
+        # values with fixed passing of the argument to callbacks, set at registration
+        self._pass_args: dict[int, bool] = {}
         self._server = server
 
         self._workers_count = workers
+        self._max_workers = max(workers, max_workers or workers)
         self._workers: list[threading.Thread] = []
+        self._workers_lock = threading.Lock()
+        self._busy_workers = 0
+        self._saturated_batches = 0
+        self._tasks: set[asyncio.Task] = set()
+        # asyncio reader, one per manager, reading batches only while run_async is running
+        self._reader: threading.Thread | None = None
+        self._reader_cond = threading.Condition()
+        self._async_batches: deque[list[tuple[int, Any]]] = deque()
+        self._async_wakeup: tuple[asyncio.AbstractEventLoop, asyncio.Event] | None = None
         self._error_handler = error_handler or self._default_error_handler
 
     def start_manager(self) -> None:
-        """Start the signals manager."""
-        for i in range(self._workers_count):
-            worker = threading.Thread(target=self._run, args=(i,), daemon=True, name=f"signals_worker_{i}")
-            self._workers.append(worker)
-            worker.start()
+        """Start the signals manager.
+
+        If all workers are busy and signals keep waiting, additional workers are started up to the maximum workers
+        count.
+        """
+        with self._workers_lock:
+            for i in range(self._workers_count):
+                self._workers.append(self._start_worker(i))
 
     def check_workers(self) -> None:
-        """Check the workers. If a worker is not alive, restart it."""
-        for i, worker in enumerate(self._workers):
-            if not worker.is_alive():
-                self._workers[i] = threading.Thread(
-                    target=self._run, args=(i,), daemon=True, name=f"signals_worker_{i}"
-                )
-                self._workers[i].start()
+        """Check the workers. If a worker is not alive, restart it.
+
+        Workers recover from errors in callbacks and in the error handler, so a worker is restarted only if it was
+        stopped in some other way.
+        """
+        with self._workers_lock:
+            for i, worker in enumerate(self._workers):
+                if not worker.is_alive():
+                    self._workers[i] = self._start_worker(i)
+
+    def _worker_started(self) -> bool:
+        # returns True if the busy workers are counted
+        with self._workers_lock:
+            if len(self._workers) >= self._max_workers:
+                return False
+            self._busy_workers += 1
+            return True
+
+    def _worker_finished(self) -> None:
+        # signals which came while all workers were busy are still waiting, start new worker if it lasts
+        with self._workers_lock:
+            if self._busy_workers >= len(self._workers) and self._server.signals_queue_len() > 0:
+                self._saturated_batches += 1
+            else:
+                self._saturated_batches = 0
+            self._busy_workers -= 1
+
+            if self._saturated_batches >= _SATURATED_BATCHES and len(self._workers) < self._max_workers:
+                self._saturated_batches = 0
+                self._workers.append(self._start_worker(len(self._workers)))
+
+    def _start_worker(self, thread_id: int) -> threading.Thread:
+        worker = threading.Thread(target=self._run, args=(thread_id,), daemon=True, name=f"signals_worker_{thread_id}")
+        worker.start()
+        return worker
 
     def _run(self, thread_id) -> None:
+        # last resort, an error escaping the processing restarts the loop in the same thread
+        while True:
+            try:
+                self._run_loop(thread_id)
+            except Exception as e:
+                self._handle_error(e)
+
+    def _handle_error(self, error: Exception) -> None:
+        # the error handler is never called with its own error, so the processing can continue
+        try:
+            self._error_handler(error)
+        except Exception:
+            traceback.print_exc()
+
+    def _run_loop(self, thread_id) -> None:
+        get_signals = self._server.value_get_signal_batch
         while True:
-            ind, arg = self._server.value_get_signal(thread_id)
-            callbacks = self._callbacks.get(ind, None)
-            if callbacks:
-                for callback in callbacks:
+            batch = get_signals(thread_id, _SIGNALS_BATCH)
+            signals = iter(batch)
+            dispatch_map = self._dispatch
+            error_handler = self._handle_error
+            counted = self._worker_started()
+            try:
+                # the try block is outside of the loop, after an error the same iterator continues with the next signal
+                while True:
                     try:
-                        if inspect.ismethod(callback) and callback.__code__.co_argcount == 1:
-                            callback()
-                        elif callback.__code__.co_argcount == 0:
-                            callback()
-                        else:
-                            callback(arg)
+                        self._dispatch_signals(signals, dispatch_map, error_handler)
+                        break
                     except Exception as e:
-                        self._error_handler(e)
-            else:
-                error = IndexError(f"Signal with index {ind} not found.")
-                self._error_handler(error)
+                        error_handler(e)
+            finally:
+                if counted:
+                    self._worker_finished()
+
+            # pending signals are taken without releasing the GIL, let other threads run after a large batch
+            if len(batch) >= _YIELD_BATCH:
+                time.sleep(0)
 
     @staticmethod
-    def _default_error_handler(_e: Exception) -> None:
-        traceback.print_exc()
+    def _dispatch_signals(
+        signals: Iterator[tuple[int, Any]],
+        dispatch_map: dict[int, Callable[[Any], Any]],
+        error_handler: Callable[[Exception], None],
+    ) -> None:
+        for ind, arg in signals:
+            try:
+                dispatch = dispatch_map[ind]
+            except KeyError:
+                error_handler(IndexError(f"Signal with index {ind} not found."))
+                continue
+            dispatch(arg)
+
+    def _make_dispatch(self, callbacks: tuple[tuple[Callable, bool], ...]) -> Callable[[Any], Any]:
+        if len(callbacks) == 1:
+            callback, pass_arg = callbacks[0]
+            if pass_arg:
+                return callback
+            return lambda _arg: callback()
+
+        def dispatch_all(arg: Any) -> None:
+            callbacks_iter = iter(callbacks)
+            while True:
+                try:
+                    for callback, pass_arg in callbacks_iter:
+                        if pass_arg:
+                            callback(arg)
+                        else:
+                            callback()
+                    return
+                except Exception as e:
+                    self._handle_error(e)
+
+        return dispatch_all
+
+    def _set_callbacks(self, value_id: int, callbacks: tuple[tuple[Callable, bool], ...]) -> None:
+        self._callbacks[value_id] = callbacks
+        if callbacks:
+            self._dispatch[value_id] = self._make_dispatch(callbacks)
+        else:
+            self._dispatch.pop(value_id, None)
+
+    async def run_async(self) -> None:
+        """Process the signals in the running asyncio event loop.
+
+        Signals are read from the core by a reader thread and the callbacks are called in the event loop. If a callback
+        or the error handler returns a coroutine, it is scheduled as a task. Runs until it is cancelled.
+
+        Only one run_async can run at the same time. Signals the reader takes from the core around the cancellation
+        are kept and processed by the next run_async call, they are lost if it is never called again.
+        """
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+        with self._reader_cond:
+            if self._async_wakeup is not None:
+                raise RuntimeError("Signals are already processed in an asyncio event loop.")
+            self._async_wakeup = (loop, wakeup)
+            self._reader_cond.notify()
+            if self._reader is None or not self._reader.is_alive():
+                self._reader = threading.Thread(target=self._read_signals, daemon=True, name="signals_reader")
+                self._reader.start()
+
+        batches = self._async_batches
+        try:
+            while True:
+                while batches:
+                    self._dispatch_async(loop, batches.popleft())
+                wakeup.clear()
+                if not batches:
+                    await wakeup.wait()
+        finally:
+            with self._reader_cond:
+                self._async_wakeup = None
+
+    def _dispatch_async(self, loop: asyncio.AbstractEventLoop, signals: list[tuple[int, Any]]) -> None:
+        callbacks_map = self._callbacks
+        for ind, arg in signals:
+            try:
+                callbacks = callbacks_map[ind]
+            except KeyError:
+                self._handle_error_async(loop, IndexError(f"Signal with index {ind} not found."))
+                continue
+
+            for callback, pass_arg in callbacks:
+                try:
+                    result = callback(arg) if pass_arg else callback()
+                except Exception as e:
+                    self._handle_error_async(loop, e)
+                else:
+                    if inspect.iscoroutine(result):
+                        self._create_task(loop, result)
+
+    def _read_signals(self) -> None:
+        get_signals = self._server.value_get_signal_batch
+        cond = self._reader_cond
+        while True:
+            with cond:
+                cond.wait_for(lambda: self._async_wakeup is not None)
+
+            signals = get_signals(_READER_THREAD_ID, _SIGNALS_BATCH)
+            with cond:
+                self._async_batches.append(signals)
+                wakeup = self._async_wakeup
+
+            if wakeup is not None:
+                loop, event = wakeup
+                try:
+                    loop.call_soon_threadsafe(event.set)
+                except RuntimeError:  # event loop is closed, batch is kept for the next run
+                    pass
+
+    def _create_task(self, loop: asyncio.AbstractEventLoop, coroutine) -> None:
+        task = loop.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and (e := task.exception()) is not None:
+            self._handle_error_async(task.get_loop(), e)
+
+    def _handle_error_async(self, loop: asyncio.AbstractEventLoop, error: BaseException) -> None:
+        try:
+            result = self._error_handler(error)
+        except Exception:
+            traceback.print_exc()
+        else:
+            if inspect.iscoroutine(result):
+                task = loop.create_task(result)
+                self._tasks.add(task)
+                task.add_done_callback(self._error_task_done)
+
+    def _error_task_done(self, task: asyncio.Task) -> None:
+        # the error handler is never called with its own error
+        self._tasks.discard(task)
+        if not task.cancelled() and (e := task.exception()) is not None:
+            traceback.print_exception(e)
+
+    @staticmethod
+    def _default_error_handler(e: Exception) -> None:
+        traceback.print_exception(e)
 
     def set_error_handler(self, error_handler: Callable[[Exception], None] | None) -> None:
         """Set custom error handler."""
         self._error_handler = error_handler or self._default_error_handler
 
+    def register_value(self, value_id: int, pass_arg: bool | None = None) -> None:
+        """Register a value to the signals manager.
+
+        Args:
+            value_id: The id of the value.
+            pass_arg: If the value is passed to the callbacks. If None, it is decided for each callback.
+        """
+        with self._callbacks_lock:
+            self._callbacks.setdefault(value_id, ())
+            if pass_arg is not None:
+                self._pass_args[value_id] = pass_arg
+
     def add_callback(self, value_id: int, callback: Callable) -> None:
         """Add a callback to a signal."""
-        if value_id in self._callbacks:
-            self._callbacks[value_id].append(callback)
-        else:
-            self._callbacks[value_id] = [callback]
-        self._server.value_set_register(value_id, True)
+        pass_arg = self._pass_args.get(value_id)
+        if pass_arg is None:
+            pass_arg = _takes_argument(callback)
+        entry = (callback, pass_arg)
+        with self._callbacks_lock:
+            self._set_callbacks(value_id, self._callbacks.get(value_id, ()) + (entry,))
+            self._server.value_set_register(value_id, True)
 
     def remove_callback(self, value_id: int, callback: Callable) -> None:
         """Remove a callback from a signal."""
-        if value_id in self._callbacks:
-            if callback in self._callbacks[value_id]:
-                self._callbacks[value_id].remove(callback)
-                if not self._callbacks[value_id]:
-                    self._server.value_set_register(value_id, False)
+        with self._callbacks_lock:
+            callbacks = self._callbacks.get(value_id, ())
+            for i, (cb, _) in enumerate(callbacks):
+                if cb == callback:
+                    callbacks = callbacks[:i] + callbacks[i + 1 :]
+                    self._set_callbacks(value_id, callbacks)
+                    if not callbacks:
+                        self._server.value_set_register(value_id, False)
+                    break
 
     def clear_callbacks(self, value_id: int) -> None:
         """Clear all callbacks from a signal."""
-        if value_id in self._callbacks:
-            self._callbacks[value_id].clear()
-            self._server.value_set_register(value_id, False)
+        with self._callbacks_lock:
+            if self._callbacks.get(value_id):
+                self._set_callbacks(value_id, ())
+                self._server.value_set_register(value_id, False)
@@ -1,6 +1,8 @@
 # ruff: noqa: D107
+import heapq
+import itertools
 from abc import ABC, abstractmethod
-from collections.abc import Buffer, Callable
+from collections.abc import Buffer, Callable, Iterable, Iterator
 from typing import Any
 
 import numpy as np
@@ -10,13 +12,31 @@ from egui_pysync.signals import SignalsManager
 from egui_pysync.typing import SteteServerCoreBase
 
 
-class _Counter:
-    def __init__(self) -> None:
-        self._counter = 9  # first 10 values are reserved for system signals
+type _IdCounter = Iterator[int]
 
-    def get_id(self) -> int:
-        self._counter += 1
-        return self._counter
+
+def _new_counter() -> _IdCounter:
+    return itertools.count(10)  # first 10 values are reserved for system signals
+
+
+# states generated by older versions create the counter with sc._Counter()
+_Counter = _new_counter
+
+
+def _contiguous_rows(data: Buffer, positive_rows: bool = False) -> Buffer:
+    # core can read arrays with strided rows, but items in one row has to be contiguous
+    # strides are checked directly, numpy contiguous flags ignore strides of dimensions with length 1
+    # images also need positive rows stride, flipped or broadcast images are copied
+    if isinstance(data, np.ndarray):
+        if positive_rows and data.ndim > 1 and data.strides[0] <= 0:
+            return data.copy(order="C")
+
+        stride = data.itemsize
+        for dim in range(data.ndim - 1, 0 if data.ndim > 1 else -1, -1):
+            if data.strides[dim] != stride:
+                return data.copy(order="C")
+            stride *= data.shape[dim]
+    return data
 
 
 class _StatesBase:
@@ -32,6 +52,8 @@ class _MainStatesBase(_StatesBase, ABC):
 class ErrorSignal:
     """Error signal for processing errors from the state server."""
 
+    __slots__ = ("_value_id", "_signals_manager")
+
     def __init__(self, siganls_manager: SignalsManager):
         """Initialize the ErrorSignal."""
         self._value_id = 0
@@ -59,27 +81,39 @@ class ErrorSignal:
 
 
 class _StaticBase:
+    __slots__ = ("_value_id", "_server")
+
     _server: SteteServerCoreBase
 
-    def __init__(self, counter: _Counter) -> None:
-        self._value_id = counter.get_id()
+    def __init__(self, counter: _IdCounter) -> None:
+        self._value_id = next(counter)
 
     def _initialize_base(self, server: SteteServerCoreBase):
         self._server = server
 
 
 class _ValueBase(_StaticBase):
+    __slots__ = ("_signals_manager",)
+
     _signals_manager: SignalsManager
+    _pass_arg: bool | None = None  # if the value is passed to callbacks, None means it is decided per callback
 
     def _initialize_value(self, server: SteteServerCoreBase, signals_manager: SignalsManager):
-        self._server = server
+        self._initialize_base(server)
         self._signals_manager = signals_manager
-        # signals_manager.register_signal(self._value_id)
+        signals_manager.register_value(self._value_id, self._pass_arg)
 
 
 class Value[T](_ValueBase):
     """General UI value of type T."""
 
+    __slots__ = ("_set", "_get")
+
+    def _initialize_base(self, server: SteteServerCoreBase):
+        super()._initialize_base(server)
+        self._set = server.value_set
+        self._get = server.value_get
+
     def set(self, value: T, set_signal: bool = False, update: bool = False) -> None:
         """Set the value of the UI element.
 
@@ -88,7 +122,7 @@ class Value[T](_ValueBase):
             set_signal(bool, optional): Whether to set the signal. Defaults to True.
             update(bool, optional): Whether to update the UI. Defaults to False.
         """
-        self._server.value_set(self._value_id, value, set_signal, update)
+        self._set(self._value_id, value, set_signal, update)
 
     def get(self) -> T:
         """Get the value of the UI element.
@@ -96,7 +130,7 @@ class Value[T](_ValueBase):
         Returns:
             T: The value of the UI element.
         """
-        return self._server.value_get(self._value_id)
+        return self._get(self._value_id)
 
     def connect(self, callback: Callable[[T], Any]) -> None:
         """Connect a callback to the value.
@@ -122,6 +156,8 @@ class Value[T](_ValueBase):
 class ValueStatic[T](_StaticBase):
     """Numeric static UI value of type T. Static means that the value is not updated in the UI."""
 
+    __slots__ = ()
+
     def set(self, value: T, update: bool = False) -> None:
         """Set the static value of the UI.
 
@@ -143,6 +179,8 @@ class ValueStatic[T](_StaticBase):
 class Signal[T](_ValueBase):
     """Signal from UI."""
 
+    __slots__ = ()
+
     def set(self, value: T) -> None:
         """Set the signal value.
 
@@ -177,6 +215,10 @@ class Signal[T](_ValueBase):
 class SignalEmpty(_ValueBase):
     """Empty Signal from UI."""
 
+    __slots__ = ()
+
+    _pass_arg = False
+
     def set(self) -> None:
         """Set the signal value.
 
@@ -208,6 +250,8 @@ class SignalEmpty(_ValueBase):
 class ValueImage(_StaticBase):
     """Image UI element."""
 
+    __slots__ = ()
+
     def set(
         self,
         image: Buffer,
@@ -222,7 +266,7 @@ class ValueImage(_StaticBase):
                                                            Defaults to None.
             update(bool, optional): Whether to update the UI. Defaults to True.
         """
-        self._server.image_set(self._value_id, image, update, origin)
+        self._server.image_set(self._value_id, _contiguous_rows(image, positive_rows=True), update, origin)
 
     def get(self) -> npt.NDArray[np.uint8]:
         """Get the image in the UI image.
@@ -247,6 +291,13 @@ class ValueImage(_StaticBase):
 class ValueDict[K, V](_StaticBase):
     """Dict UI element."""
 
+    __slots__ = ("_set_item", "_get_item")
+
+    def _initialize_base(self, server: SteteServerCoreBase):
+        super()._initialize_base(server)
+        self._set_item = server.dict_item_set
+        self._get_item = server.dict_item_get
+
     def set(self, value: dict[K, V], update: bool = False) -> None:
         """Set the dict in the UI dict.
 
@@ -272,7 +323,7 @@ class ValueDict[K, V](_StaticBase):
             value(V): The value of the item.
             update(bool, optional): Whether to update the UI. Defaults to False.
         """
-        self._server.dict_item_set(self._value_id, key, value, update)
+        self._set_item(self._value_id, key, value, update)
 
     def get_item(self, key: K) -> V:
         """Get the item in the UI dict.
@@ -283,7 +334,16 @@ class ValueDict[K, V](_StaticBase):
         Returns:
             V: The value of the item.
         """
-        return self._server.dict_item_get(self._value_id, key)
+        return self._get_item(self._value_id, key)
+
+    def update(self, value: dict[K, V], update: bool = False) -> None:
+        """Set multiple items in the UI dict at once.
+
+        Args:
+            value(dict[K, V]): The items to set.
+            update(bool, optional): Whether to update the UI. Defaults to False.
+        """
+        self._server.dict_items_set_batch(self._value_id, value, update)
 
     def remove_item(self, key: K, update: bool = False) -> None:
         """Remove the item from the UI dict.
@@ -296,11 +356,11 @@ class ValueDict[K, V](_StaticBase):
 
     def __getitem__(self, key: K) -> V:
         """Get the item in the UI dict."""
-        return self.get_item(key)
+        return self._get_item(self._value_id, key)
 
     def __setitem__(self, key: K, value: V) -> None:
         """Set the item in the UI dict."""
-        self.set_item(key, value, update=False)
+        self._set_item(self._value_id, key, value, False)
 
     def __delitem__(self, key: K) -> None:
         """Remove the item from the UI dict."""
@@ -310,6 +370,13 @@ class ValueDict[K, V](_StaticBase):
 class ValueList[T](_StaticBase):
     """List UI element."""
 
+    __slots__ = ("_set_item", "_get_item")
+
+    def _initialize_base(self, server: SteteServerCoreBase):
+        super()._initialize_base(server)
+        self._set_item = server.list_item_set
+        self._get_item = server.list_item_get
+
     def set(self, value: list[T], update: bool = False) -> None:
         """Set the list in the UI list.
 
@@ -335,7 +402,7 @@ class ValueList[T](_StaticBase):
             value(T): The value of the item.
             update(bool, optional): Whether to update the UI. Defaults to False.
         """
-        self._server.list_item_set(self._value_id, idx, value, update)
+        self._set_item(self._value_id, idx, value, update)
 
     def get_item(self, idx: int) -> T:
         """Get the item in the UI list.
@@ -346,7 +413,7 @@ class ValueList[T](_StaticBase):
         Returns:
             T: The value of the item.
         """
-        return self._server.list_item_get(self._value_id, idx)
+        return self._get_item(self._value_id, idx)
 
     def remove_item(self, idx: int, update: bool = False) -> None:
         """Remove the item from the UI list.
@@ -366,18 +433,29 @@ class ValueList[T](_StaticBase):
         """
         self._server.list_item_add(self._value_id, value, update)
 
+    def extend(self, values: Iterable[T], update: bool = False) -> None:
+        """Add multiple items to the UI list at once.
+
+        Args:
+            values(Iterable[T]): The values of the items.
+            update(bool, optional): Whether to update the UI. Defaults to False.
+        """
+        self._server.list_items_add_batch(self._value_id, values, update)
+
     def __getitem__(self, idx: int) -> T:
         """Get the item in the UI list."""
-        return self.get_item(idx)
+        return self._get_item(self._value_id, idx)
 
     def __setitem__(self, idx: int, value: T) -> None:
         """Set the item in the UI list."""
-        self.set_item(idx, value, update=False)
+        self._set_item(self._value_id, idx, value, False)
 
 
 class Graph:
     """Graph UI element."""
 
+    __slots__ = ("_value_id", "_idx", "_server", "_deleted")
+
     def __init__(self, value_id: int, idx: int, server: SteteServerCoreBase):
         """Initialize the Graph."""
         self._value_id = value_id
@@ -418,7 +496,7 @@ class Graph:
             update(bool, optional): Whether to update the UI. Defaults to False.
         """
         self._check()
-        self._server.graphs_add_points(self._value_id, self._idx, points, update)
+        self._server.graphs_add_points(self._value_id, self._idx, _contiguous_rows(points), update)
 
     def set(self, graph: Buffer, update: bool = False) -> None:
         """Set the graph to the UI graphs.
@@ -428,7 +506,7 @@ class Graph:
             update(bool, optional): Whether to update the UI. Defaults to False.
         """
         self._check()
-        self._server.graphs_set(self._value_id, self._idx, graph, update)
+        self._server.graphs_set(self._value_id, self._idx, _contiguous_rows(graph), update)
 
     def get(self) -> npt.NDArray[np.float32 | np.float64]:
         """Get the graph from the UI graphs.
@@ -464,11 +542,14 @@ class Graph:
 class ValueGraphs(_StaticBase):
     """Graph UI element."""
 
-    def __init__(self, counter: _Counter):  # noqa: D107
+    __slots__ = ("_graphs", "_next_idx", "_free_idxs")
+
+    def __init__(self, counter: _IdCounter):  # noqa: D107
         super().__init__(counter)
 
         self._graphs: dict[int, Graph] = {}
-        self.__getitem__ = self.get
+        self._next_idx = 0  # all indexes from this one are free
+        self._free_idxs: list[tuple[int, int]] = []  # heap of free index ranges [start, stop) below _next_idx
 
     def get(self, idx: int) -> Graph:
         """Get the graph by index.
@@ -496,19 +577,39 @@ class ValueGraphs(_StaticBase):
             update(bool, optional): Whether to update the UI. Defaults to False.
         """
         if idx is None:
-            idx = 0
-            while idx in self._graphs:
-                idx += 1
+            idx = self._free_idxs[0][0] if self._free_idxs else self._next_idx
         elif idx in self._graphs:
             existing_graph = self._graphs[idx]
             existing_graph.set(graph, update)
             return existing_graph
 
-        self._server.graphs_set(self._value_id, idx, graph, update)
+        self._server.graphs_set(self._value_id, idx, _contiguous_rows(graph), update)
+        self._take_idx(idx)
         graph_obj = Graph(self._value_id, idx, self._server)
         self._graphs[idx] = graph_obj
         return graph_obj
 
+    def _take_idx(self, idx: int) -> None:
+        free = self._free_idxs
+        if idx >= self._next_idx:
+            if idx > self._next_idx:
+                heapq.heappush(free, (self._next_idx, idx))
+            self._next_idx = idx + 1
+        elif free[0][0] == idx:
+            stop = free[0][1]
+            if idx + 1 < stop:
+                heapq.heapreplace(free, (idx + 1, stop))
+            else:
+                heapq.heappop(free)
+        else:
+            i = next(i for i, (start, stop) in enumerate(free) if start <= idx < stop)
+            start, stop = free.pop(i)
+            if start < idx:
+                free.append((start, idx))
+            if idx + 1 < stop:
+                free.append((idx + 1, stop))
+            heapq.heapify(free)
+
     def remove(self, graph: Graph, update: bool = False) -> None:
         """Remove the graph from the UI graphs.
 
@@ -520,6 +621,7 @@ class ValueGraphs(_StaticBase):
             graph._kill()
             self._server.graphs_remove(self._value_id, graph.idx, update)
             self._graphs.pop(graph.idx)
+            heapq.heappush(self._free_idxs, (graph.idx, graph.idx + 1))
 
     def remove_idx(self, idx: int, update: bool = False) -> None:
         """Remove the graph from the UI graphs.
@@ -532,6 +634,7 @@ class ValueGraphs(_StaticBase):
             self._graphs[idx]._kill()
             self._server.graphs_remove(self._value_id, idx, update)
             self._graphs.pop(idx)
+            heapq.heappush(self._free_idxs, (idx, idx + 1))
 
     def clear(self, update: bool = False) -> None:
         """Clear the all UI graphs.
@@ -540,4 +643,10 @@ class ValueGraphs(_StaticBase):
             update(bool, optional): Whether to update the UI. Defaults to False.
         """
         self._graphs.clear()
+        self._next_idx = 0
+        self._free_idxs.clear()
         self._server.graphs_clear(self._value_id, update)
+
+    def __getitem__(self, idx: int) -> Graph:
+        """Get the graph by index."""
+        return self.get(idx)
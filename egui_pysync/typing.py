@@ -1,5 +1,5 @@
 # ruff: noqa: D101, D102, D107
-from collections.abc import Buffer
+from collections.abc import Buffer, Iterable
 from enum import Enum
 from typing import Any
 
@@ -18,6 +18,7 @@ class SteteServerCoreBase:
     # values ----------------------------------------------------------------------
     def value_set(self, value_id: int, value: Any, set_signal: bool, update: bool) -> None: ...
     def value_get(self, value_id: int) -> Any: ...
+    def values_set_batch(self, values: list[tuple[int, Any]], set_signal: bool, update: bool) -> None: ...
 
     # static ----------------------------------------------------------------------
     def static_set(self, value_id: int, value: Any, update: bool) -> None: ...
@@ -25,7 +26,9 @@ class SteteServerCoreBase:
 
     # signals ---------------------------------------------------------------------
     def value_get_signal(self, thread_id) -> tuple[int, tuple[Any, ...]]: ...
+    def value_get_signal_batch(self, thread_id: int, max_n: int) -> list[tuple[int, tuple[Any, ...]]]: ...
     def value_set_register(self, value_id: int, register: bool) -> None: ...
+    def signals_queue_len(self) -> int: ...
     def signal_set(self, value_id: int, value: Any) -> None: ...
 
     # image -----------------------------------------------------------------------
@@ -40,6 +43,7 @@ class SteteServerCoreBase:
     def dict_get(self, value_id: int) -> dict[Any, Any]: ...
     def dict_item_set(self, value_id: int, key: Any, value: Any, update: bool) -> None: ...
     def dict_item_get(self, value_id: int, key: Any) -> Any: ...
+    def dict_items_set_batch(self, value_id: int, value: dict[Any, Any], update: bool) -> None: ...
     def dict_item_del(self, value_id: int, key: Any, update: bool) -> None: ...
     def dict_len(self, value_id: int) -> int: ...
 
@@ -50,6 +54,7 @@ class SteteServerCoreBase:
     def list_item_get(self, value_id: int, idx: int) -> Any: ...
     def list_item_del(self, value_id: int, idx: int, update: bool) -> None: ...
     def list_item_add(self, value_id: int, value: Any, update: bool) -> None: ...
+    def list_items_add_batch(self, value_id: int, values: Iterable[Any], update: bool) -> None: ...
     def list_len(self, value_id: int) -> int: ...
 
     # graphs ----------------------------------------------------------------------